@@ -10,6 +10,7 @@ from queryprocessor.operator import (
     HashJoinOp,
     OrderByOp,
     OrderedSelectOp,
+    SortedRangeSelectOp,
     ScanOp,
     IndexScanOp,
 )
@@ -52,14 +53,15 @@ order_plan = QueryPlan(
     plan=ProjectOp(
         ["title", "year", "genre"],
         SelectOp("year == 1970", OrderByOp("year", ScanOp(album_relation))),
-    )
+    ),
+    optimize=False,
 )
 
-# sort album by year in ascending order before selecting, using a order-aware select operator
+# sort album by year in ascending order, then binary search for the selected years
 order_plan2 = QueryPlan(
     plan=ProjectOp(
         ["title", "year", "genre"],
-        OrderedSelectOp("year == 1970", OrderByOp("year", ScanOp(album_relation))),
+        SortedRangeSelectOp("year", 1970, ScanOp(album_relation)),
     )
 )
 
@@ -8,6 +8,7 @@ from queryprocessor.operator import (
     JoinOp,
     RenameOp,
     HashJoinOp,
+    IndexedHashJoinOp,
     OrderByOp,
     OrderedSelectOp,
     ScanOp,
@@ -51,6 +52,19 @@ with open("album_artist.dot", "w") as f:
 
 # simple plan for SELECT title, name, year FROM album JOIN artist ON artist_id = id WHERE year = 1970
 nested_loop_join_plan = QueryPlan(
+    plan=SelectOp(
+        "year == 1970",
+        ProjectOp(
+            ["title", "name", "year"],
+            JoinOp("artist_id == id", ScanOp(album_relation), ScanOp(artist_relation)),
+        ),
+    ),
+    optimize=False,
+)
+
+# the same plan after the rewrites in queryprocessor/rewrite.py push the selection
+# below the projection and the join
+pushdown_plan = QueryPlan(
     plan=SelectOp(
         "year == 1970",
         ProjectOp(
@@ -70,7 +84,25 @@ hash_join_plan = QueryPlan(
                 ("artist_id", "id"), ScanOp(album_relation), ScanOp(artist_relation)
             ),
         ),
-    )
+    ),
+    optimize=False,
+)
+
+# use the index on artist.id as the hash table of the join
+indexed_hash_join_plan = QueryPlan(
+    plan=SelectOp(
+        "year == 1970",
+        ProjectOp(
+            ["title", "name", "year"],
+            IndexedHashJoinOp(
+                ("artist_id", "id"),
+                artist_relation,
+                ScanOp(album_relation),
+                table_side="right",
+            ),
+        ),
+    ),
+    optimize=False,
 )
 
 # select year on album before join
@@ -82,7 +114,8 @@ select_first = QueryPlan(
             SelectOp("year == 1970", ScanOp(album_relation)),
             ScanOp(artist_relation),
         ),
-    )
+    ),
+    optimize=False,
 )
 
 # index scan on year
@@ -97,7 +130,8 @@ index_scan_plan = QueryPlan(
                 ScanOp(artist_relation),
             ),
         ),
-    )
+    ),
+    optimize=False,
 )
 
 # index scan with hashjoin
@@ -112,13 +146,16 @@ index_scan_plan2 = QueryPlan(
                 ScanOp(artist_relation),
             ),
         ),
-    )
+    ),
+    optimize=False,
 )
 
 
 plans = {
     "nested_loop_join": nested_loop_join_plan,
+    "nested_loop_join_pushdown": pushdown_plan,
     "hash_join": hash_join_plan,
+    "indexed_hash_join": indexed_hash_join_plan,
     "select_first": select_first,
     "index_scan_naive_join": index_scan_plan,
     "index_scan_hash_join": index_scan_plan2,
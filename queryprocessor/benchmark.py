@@ -6,11 +6,13 @@ from typing import Dict, List
 
 
 def benchmark(
-    relations: List[Relation], plans: Dict[str, QueryPlan], max_k=5
+    relations: List[Relation], plans: Dict[str, QueryPlan], max_k=5, collect=False
 ) -> pd.DataFrame:
     """
     Benchmark the execution of a query plan against a relation.
-    Log the seconds+milliseconds to run the query as the size of the relation increases
+    Log the seconds+milliseconds to run the query as the size of the relation increases.
+    Result rows are counted as they are produced; pass collect=True to also hold
+    them all in a list, as a client of the query would.
     """
 
     relation_sizes = map(lambda k: 10**k, range(1, max_k + 1))
@@ -28,10 +30,15 @@ def benchmark(
                 continue
             print(f"\tRunning benchmark for query {name}")
             start = time.time()
-            rows = list(plan.execute())
+            if collect:
+                rows = len(list(plan.execute()))
+            else:
+                rows = 0
+                for _ in plan.execute():
+                    rows += 1
             end = time.time()
             timings.append(
-                {"rows": len(rows), "size": size, "time": end - start, "plan": name}
+                {"rows": rows, "size": size, "time": end - start, "plan": name}
             )
 
     return pd.DataFrame(timings)
@@ -0,0 +1,63 @@
+"""
+Numba kernels for the build and probe phases of a hash join on integer keys.
+
+The hash table maps each key to the position of its first row on the build side;
+further rows with the same key are chained through the next_idx array, so the
+build side is never copied into Python objects.
+"""
+import numpy as np
+
+try:
+    import numba as nb
+    from numba import types
+    from numba.typed import Dict
+except ImportError:  # numba is optional; HashJoinOp falls back to Python dicts
+    nb = None
+
+AVAILABLE = nb is not None
+
+
+if AVAILABLE:
+
+    @nb.njit(cache=True)
+    def build_int64(keys):
+        """Build the hash table for the int64 join keys of the build side"""
+        table = Dict.empty(key_type=types.int64, value_type=types.int64)
+        next_idx = np.full(len(keys), -1, dtype=np.int64)
+        # insert in reverse so each chain lists rows in their original order
+        for i in range(len(keys) - 1, -1, -1):
+            if keys[i] in table:
+                next_idx[i] = table[keys[i]]
+            table[keys[i]] = i
+        return table, next_idx
+
+    @nb.njit(cache=True)
+    def probe_int64(table, next_idx, probe_keys):
+        """
+        Probe the hash table with the int64 join keys of the probe side. Returns the
+        positions of the matching (build, probe) row pairs in probe order.
+        """
+        count = 0
+        for j in range(len(probe_keys)):
+            i = table[probe_keys[j]] if probe_keys[j] in table else -1
+            while i != -1:
+                count += 1
+                i = next_idx[i]
+
+        build_idx = np.empty(count, dtype=np.int64)
+        probe_idx = np.empty(count, dtype=np.int64)
+        k = 0
+        for j in range(len(probe_keys)):
+            i = table[probe_keys[j]] if probe_keys[j] in table else -1
+            while i != -1:
+                build_idx[k] = i
+                probe_idx[k] = j
+                k += 1
+                i = next_idx[i]
+        return build_idx, probe_idx
+
+    # compile the kernels (or load them from numba's cache) once on import, so the
+    # first join does not pay for it
+    _keys = np.zeros(1, dtype=np.int64)
+    probe_int64(*build_int64(_keys), _keys)
+    del _keys
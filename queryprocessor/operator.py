@@ -1,12 +1,289 @@
 """
 Provides simple implementations of the relational algebra operators. 
 """
+import ast
+import bisect
 import time
+from functools import lru_cache
+from operator import itemgetter
+import numpy as np
+
+try:
+    import numexpr
+except ImportError:  # numexpr is optional; predicates fall back to NumPy
+    numexpr = None
+from queryprocessor import jit_join
 from queryprocessor.algebra import Scan, Select, Project, Join, Rename, AlgebraNode
 from queryprocessor.parse import parse_sql
 from queryprocessor.relation import Relation, Schema, Attribute
 from dataclasses import dataclass
-from typing import Optional, Any, Tuple
+from typing import (
+    Optional,
+    Any,
+    Tuple,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    FrozenSet,
+)
+
+# a batch of rows stored column-wise: attribute name to NumPy array of values
+Batch = Dict[str, np.ndarray]
+
+# number of rows per batch produced by the column-wise scan
+BATCH_SIZE = 65536
+
+# fraction of rows assumed to satisfy a selection when estimating cardinalities
+SELECTIVITY = 0.1
+
+
+def _bound_names(tree: ast.AST) -> FrozenSet[str]:
+    """Return the names bound inside a predicate by comprehensions and lambdas"""
+    bound = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.comprehension):
+            bound.update(
+                name.id for name in ast.walk(node.target) if isinstance(name, ast.Name)
+            )
+        elif isinstance(node, ast.Lambda):
+            args = node.args
+            bound.update(
+                arg.arg
+                for arg in [*args.posonlyargs, *args.args, *args.kwonlyargs]
+                + [args.vararg, args.kwarg]
+                if arg is not None
+            )
+    return frozenset(bound)
+
+
+class _RowReferences(ast.NodeTransformer):
+    """Rewrite the attribute names in a predicate into lookups on a row dictionary"""
+
+    # names bound inside the predicate, which are not attributes
+    bound: FrozenSet[str] = frozenset()
+
+    def visit_Expression(self, node):
+        self.bound = _bound_names(node)
+        self.generic_visit(node)
+        return node
+
+    def visit_Call(self, node):
+        # leave called names (e.g. len) alone, but rewrite their arguments
+        if not isinstance(node.func, ast.Name):
+            node.func = self.visit(node.func)
+        node.args = [self.visit(arg) for arg in node.args]
+        node.keywords = [self.visit(keyword) for keyword in node.keywords]
+        return node
+
+    def visit_Name(self, node):
+        if not isinstance(node.ctx, ast.Load) or node.id in self.bound:
+            return node
+        lookup = ast.Subscript(
+            value=ast.Name(id="row", ctx=ast.Load()),
+            slice=ast.Constant(node.id),
+            ctx=ast.Load(),
+        )
+        return ast.copy_location(lookup, node)
+
+
+class _TupleReferences(_RowReferences):
+    """Rewrite the attribute names in a predicate into positional lookups on a tuple"""
+
+    def __init__(self, positions: Dict[str, int]):
+        self.positions = positions
+
+    def visit_Name(self, node):
+        if not isinstance(node.ctx, ast.Load) or node.id in self.bound:
+            return node
+        lookup = ast.Subscript(
+            value=ast.Name(id="t", ctx=ast.Load()),
+            slice=ast.Constant(self.positions[node.id]),
+            ctx=ast.Load(),
+        )
+        return ast.copy_location(lookup, node)
+
+
+@lru_cache(maxsize=512)
+def compile_predicate(predicate: str) -> Callable[[dict], Any]:
+    """
+    Compile a predicate such as "year == 1970" into a function of a row. The
+    predicate is parsed once, so evaluating it per row is just a function call.
+    Compiled predicates are cached, so plans reusing a predicate share its function.
+    """
+    body = _RowReferences().visit(ast.parse(predicate, mode="eval")).body
+    arguments = ast.arguments(
+        posonlyargs=[],
+        args=[ast.arg(arg="row")],
+        kwonlyargs=[],
+        kw_defaults=[],
+        defaults=[],
+    )
+    tree = ast.fix_missing_locations(ast.Expression(ast.Lambda(arguments, body)))
+    return eval(compile(tree, "<predicate>", "eval"), {})
+
+
+# operators allowed in a predicate evaluated over whole columns; these behave the
+# same on NumPy arrays as on the Python values of a single row
+_COMPARISONS = (ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+_ARITHMETIC = (ast.Add, ast.Sub, ast.Mult)
+
+
+def _is_value(node, numbers: set) -> bool:
+    """Whether node is an attribute, constant or arithmetic over them"""
+    if isinstance(node, ast.Name):
+        return True
+    if isinstance(node, ast.Constant):
+        return type(node.value) in (int, float, str, bool)
+    return _is_arithmetic(node, numbers)
+
+
+def _is_arithmetic(node, numbers: set) -> bool:
+    """
+    Whether node is arithmetic (+, -, * and unary -/+) over attributes and numeric
+    constants. Attributes used in arithmetic are added to numbers, as NumPy treats
+    + and - on bool columns as logical operators rather than on integers.
+    """
+    if isinstance(node, ast.Name):
+        numbers.add(node.id)
+        return True
+    if isinstance(node, ast.Constant):
+        return type(node.value) in (int, float)
+    if isinstance(node, ast.BinOp):
+        return (
+            isinstance(node.op, _ARITHMETIC)
+            and _is_arithmetic(node.left, numbers)
+            and _is_arithmetic(node.right, numbers)
+        )
+    if isinstance(node, ast.UnaryOp):
+        return isinstance(node.op, (ast.USub, ast.UAdd)) and _is_arithmetic(
+            node.operand, numbers
+        )
+    return False
+
+
+def _is_condition(node, flags: set, numbers: set, top: bool = False) -> bool:
+    """
+    Whether node is a condition that can be evaluated over whole columns: a
+    comparison, or and/or/not over conditions. Attributes used directly as
+    conditions are added to flags, as they have to be bool columns. A constant is
+    only accepted as the whole predicate, since ~True is -2 rather than False.
+    """
+    if isinstance(node, ast.Compare):
+        return all(isinstance(op, _COMPARISONS) for op in node.ops) and all(
+            _is_value(operand, numbers) for operand in [node.left, *node.comparators]
+        )
+    if isinstance(node, ast.BoolOp):
+        return all(_is_condition(value, flags, numbers) for value in node.values)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        return _is_condition(node.operand, flags, numbers)
+    if isinstance(node, ast.Name):
+        flags.add(node.id)
+        return True
+    if isinstance(node, ast.Constant):
+        return top and isinstance(node.value, bool)
+    return False
+
+
+class _BitwiseOperators(ast.NodeTransformer):
+    """Rewrite the boolean operators of a condition into bitwise operators that
+    apply elementwise, e.g. "a < x < b and not y" -> "(a < x) & (x < b) & ~y\""""
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        op = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+        expr = node.values[0]
+        for value in node.values[1:]:
+            expr = ast.BinOp(left=expr, op=op, right=value)
+        return ast.copy_location(expr, node)
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            expr = ast.UnaryOp(op=ast.Invert(), operand=node.operand)
+            return ast.copy_location(expr, node)
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        operands = [node.left, *node.comparators]
+        expr = None
+        for left, op, right in zip(operands, node.ops, operands[1:]):
+            compare = ast.Compare(left=left, ops=[op], comparators=[right])
+            expr = compare if expr is None else ast.BinOp(expr, ast.BitAnd(), compare)
+        return ast.copy_location(expr, node)
+
+
+@dataclass(frozen=True)
+class BatchPredicate:
+    """A predicate that can be evaluated over whole columns at once"""
+    # the predicate in numexpr syntax, with and/or/not replaced by &/|/~
+    numexpr: str
+    # the same expression compiled to run on NumPy arrays
+    code: Any
+    # attributes used directly as conditions; only valid for bool columns
+    flags: FrozenSet[str]
+    # attributes used in arithmetic; only valid for columns that are not bool
+    numbers: FrozenSet[str]
+    # whether the predicate contains string constants, which numexpr cannot handle
+    strings: bool
+
+
+@lru_cache(maxsize=512)
+def batch_predicate(predicate: str) -> Optional[BatchPredicate]:
+    """
+    Prepare a predicate for evaluation over whole columns. Returns None if the
+    predicate uses anything besides comparisons, arithmetic (+, -, *), and/or/not,
+    attributes and constants, in which case it is evaluated row-at-a-time.
+    """
+    tree = ast.parse(predicate, mode="eval")
+    flags: set = set()
+    numbers: set = set()
+    if not _is_condition(tree.body, flags, numbers, top=True):
+        return None
+    strings = any(
+        isinstance(node, ast.Constant) and isinstance(node.value, str)
+        for node in ast.walk(tree)
+    )
+    bitwise = ast.fix_missing_locations(_BitwiseOperators().visit(tree))
+    code = compile(bitwise, "<predicate>", "eval")
+    return BatchPredicate(
+        ast.unparse(bitwise), code, frozenset(flags), frozenset(numbers), strings
+    )
+
+
+@lru_cache(maxsize=512)
+def predicate_columns(predicate: str) -> FrozenSet[str]:
+    """Return the names of the attributes referenced by a predicate"""
+    tree = ast.parse(predicate, mode="eval")
+    functions = {
+        node.func.id
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+    }
+    bound = _bound_names(tree)
+    return frozenset(
+        node.id
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Name)
+        and node.id not in functions
+        and node.id not in bound
+    )
+
+
+def concat_batches(batches: Iterable[Batch]) -> Optional[Batch]:
+    """Concatenate a sequence of column-wise batches into a single batch"""
+    batches = list(batches)
+    if not batches:
+        return None
+    return {name: np.concatenate([b[name] for b in batches]) for name in batches[0]}
+
+
+def batch_to_rows(batch: Batch) -> Iterator[dict]:
+    """Materialize a column-wise batch as row dictionaries of Python values"""
+    names = list(batch)
+    for values in zip(*(batch[name].tolist() for name in names)):
+        yield dict(zip(names, values))
 
 
 class QueryPlan(object):
@@ -15,12 +292,97 @@ class QueryPlan(object):
     """
 
     def __init__(
-        self, plan: "Operator"
+        self, plan: "Operator", optimize: bool = True
     ):
-        self.plan = plan
+        # imported here because the rewrite rules are written against the
+        # operators defined in this module
+        from queryprocessor.rewrite import optimize as rewrite
+
+        self.plan = rewrite(plan) if optimize else plan
+        # vectorized plans run batch-at-a-time and never use the generated loop
+        if self.plan.vectorized():
+            self._compiled, self._source = None, None
+        else:
+            self._compiled, self._source = self._codegen()
+
+    def _codegen(self):
+        """
+        Fuse a plan of the form [ProjectOp] -> SelectOp* -> ScanOp/IndexScanOp into a
+        single generated loop over the tuples of the relation, e.g.
+
+            def run(tuples):
+                for t in tuples:
+                    if t[2] == 1970:
+                        yield {'title': t[1], 'year': t[2]}
+
+        Returns the compiled function and a function returning the tuples to run it
+        on, or (None, None) if the plan has another shape.
+        """
+        op = self.plan
+        columns = None
+        if isinstance(op, ProjectOp):
+            columns, op = op.columns, op.child
+        predicates = []
+        while isinstance(op, SelectOp):
+            predicates.append(op.predicate)
+            op = op.child
+        if isinstance(op, ScanOp):
+            table = op.table
+
+            def source():
+                table.read_pages(len(table.tuples))
+                return table.tuples
+
+        elif isinstance(op, IndexScanOp):
+            table, index, value = op.table, op._index, op.value
+
+            def source():
+                tuples = index.get(value, [])  # type: ignore
+                table.read_pages(len(tuples))
+                return tuples
+
+        else:
+            return None, None
+
+        names = op.table.attribute_names
+        positions = {name: position for position, name in enumerate(names)}
+        try:
+            conditions = [
+                ast.unparse(
+                    _TupleReferences(positions).visit(ast.parse(p, mode="eval"))
+                )
+                for p in reversed(predicates)
+            ]
+            if columns is None:
+                output = "dict(zip(names, t))"
+            else:
+                output = ", ".join(f"{c!r}: t[{positions[c]}]" for c in columns)
+                output = "{" + output + "}"
+        except KeyError:
+            # the plan refers to an attribute the relation does not have
+            return None, None
+
+        lines = ["def run(tuples):", "    for t in tuples:"]
+        if conditions:
+            lines.append(f"        if {' and '.join(f'({c})' for c in conditions)}:")
+            lines.append(f"            yield {output}")
+        else:
+            lines.append(f"        yield {output}")
+        namespace = {"names": names}
+        exec(compile("\n".join(lines), "<query plan>", "exec"), namespace)
+        return namespace["run"], source
 
     def execute(self):
         """Execute the query plan"""
+        if self.plan.vectorized():
+            # run the plan batch-at-a-time and only build rows at the top
+            for batch in self.plan.iter_batches():
+                yield from batch_to_rows(batch)
+            return
+        if self._compiled is not None:
+            # run the loop generated for the plan
+            yield from self._compiled(self._source())
+            return
         for row in self.plan:
             yield row
 
@@ -35,6 +397,16 @@ class Operator:
         """Iterate over the rows produced by this operator"""
         raise NotImplementedError
 
+    def vectorized(self) -> bool:
+        """Whether this operator natively produces column-wise batches"""
+        return False
+
+    def estimate_cardinality(self) -> float:
+        """Estimate the number of rows produced by this operator"""
+        if self.child is None:
+            raise NotImplementedError
+        return self.child.estimate_cardinality()
+
     def __repr__(self):
         return f"{self.__class__.__name__}()"
 
@@ -64,11 +436,28 @@ class ScanOp(Operator):
 
     def __iter__(self):
         """Iterate over the rows produced by this operator"""
-        for row in self.table.tuples:
+        names = self.table.attribute_names
+        tuples = self.table.tuples
+        self.table.read_pages(len(tuples))
+        for row in tuples:
             # yield dictionary of attribute name to value
+            yield dict(zip(names, row))
+
+    def vectorized(self) -> bool:
+        return True
+
+    def estimate_cardinality(self) -> float:
+        return len(self.table.tuples)
+
+    def iter_batches(self) -> Iterator[Batch]:
+        """Iterate over the relation in column-wise batches"""
+        columns = self.table.columns
+        n = len(self.table.tuples)
+        for start in range(0, n, BATCH_SIZE):
+            self.table.read_pages(min(BATCH_SIZE, n - start))
             yield {
-                attr.name: value
-                for attr, value in zip(self.table.schema.attributes, row)
+                name: column[start : start + BATCH_SIZE]
+                for name, column in columns.items()
             }
 
     def __repr__(self):
@@ -86,15 +475,21 @@ class IndexScanOp(Operator):
         self.table = table
         self.index_name = index_name
         self.value = value
+        self._index = table.indexes.get(index_name)
+        if self._index is None:
+            raise ValueError(f"No index on attribute: {index_name}")
 
     def __iter__(self):
         """Iterate over the rows produced by this operator"""
-        for row in self.table.find_by_index(self.index_name, self.value):  # type: ignore
+        names = self.table.attribute_names
+        tuples = self._index.get(self.value, [])  # type: ignore
+        self.table.read_pages(len(tuples))
+        for row in tuples:
             # yield dictionary of attribute name to value
-            yield {
-                attr.name: value
-                for attr, value in zip(self.table.schema.attributes, row)
-            }
+            yield dict(zip(names, row))
+
+    def estimate_cardinality(self) -> float:
+        return len(self._index.get(self.value, []))  # type: ignore
 
     def __repr__(self):
         return f"IndexScan({self.table.name}, {self.index_name})"
@@ -109,14 +504,58 @@ class SelectOp(Operator):
     def __init__(self, predicate, child):
         super(SelectOp, self).__init__()
         self.predicate = predicate
+        self._predicate = compile_predicate(predicate)
+        self._columns = predicate_columns(predicate)
+        self._batch = batch_predicate(predicate)
         self.child = child
 
     def __iter__(self):
         """Iterate over the rows produced by this operator"""
         for row in self.child:  # type: ignore
-            if eval(self.predicate, globals(), row):
+            if self._predicate(row):
                 yield row
 
+    def apply_batch(self, batch: Batch) -> Batch:
+        """
+        Filter a batch with the predicate. Predicates over numeric columns are
+        evaluated by numexpr when it is installed; anything else (e.g. comparisons
+        on strings) is evaluated with NumPy's elementwise operators.
+        """
+        size = len(next(iter(batch.values())))
+        columns = {name: batch[name] for name in self._columns}
+        if any(
+            columns[name].dtype.kind != "b" for name in self._batch.flags
+        ) or any(columns[name].dtype.kind == "b" for name in self._batch.numbers):
+            # and/or/not over non-bool attributes depend on Python truthiness, and
+            # arithmetic over bool attributes on Python's bool-to-int conversion
+            rows = batch_to_rows(batch)
+            mask = np.fromiter((bool(self._predicate(row)) for row in rows), bool)
+        elif (
+            numexpr is not None
+            and not self._batch.strings
+            and all(column.dtype.kind in "biuf" for column in columns.values())
+        ):
+            mask = numexpr.evaluate(self._batch.numexpr, local_dict=columns)
+        else:
+            mask = eval(self._batch.code, {"__builtins__": {}}, columns)
+        mask = np.asarray(mask, dtype=bool)
+        if mask.ndim == 0:
+            mask = np.full(size, bool(mask))
+        return {name: column[mask] for name, column in batch.items()}
+
+    def vectorized(self) -> bool:
+        return self._batch is not None and self.child.vectorized()  # type: ignore
+
+    def iter_batches(self) -> Iterator[Batch]:
+        """Filter each batch of the child with a boolean mask"""
+        for batch in self.child.iter_batches():  # type: ignore
+            batch = self.apply_batch(batch)
+            if len(next(iter(batch.values()))):
+                yield batch
+
+    def estimate_cardinality(self) -> float:
+        return self.child.estimate_cardinality() * SELECTIVITY  # type: ignore
+
     def __repr__(self):
         return f"Select({self.predicate})"
 
@@ -131,18 +570,22 @@ class OrderedSelectOp(Operator):
     def __init__(self, predicate, child):
         super(OrderedSelectOp, self).__init__()
         self.predicate = predicate
+        self._predicate = compile_predicate(predicate)
         self.child = child
 
     def __iter__(self):
         """Iterate over the rows produced by this operator"""
         found = False
         for row in self.child:  # type: ignore
-            if eval(self.predicate, globals(), row):
+            if self._predicate(row):
                 found = True
                 yield row
             elif found:
                 break
 
+    def estimate_cardinality(self) -> float:
+        return self.child.estimate_cardinality() * SELECTIVITY  # type: ignore
+
     def __repr__(self):
         return f"Select({self.predicate})"
 
@@ -150,6 +593,56 @@ class OrderedSelectOp(Operator):
         return f'  "{str(self)}" [shape=box]\n' + self.child._dot()
 
 
+class SortedRangeSelectOp(Operator):
+    """Select the rows of a table whose column equals a value by sorting the table
+    on that column, then binary searching for the first and last matching rows."""
+
+    def __init__(self, column, value, child):
+        super(SortedRangeSelectOp, self).__init__()
+        self.column = column
+        self.value = value
+        self.child = child
+
+    def __iter__(self):
+        """Iterate over the rows produced by this operator"""
+        if self.vectorized():
+            for batch in self.iter_batches():
+                yield from batch_to_rows(batch)
+            return
+
+        rows = list(self.child)  # type: ignore
+        rows.sort(key=itemgetter(self.column))
+        keys = [row[self.column] for row in rows]
+        start = bisect.bisect_left(keys, self.value)
+        end = bisect.bisect_right(keys, self.value)
+        yield from rows[start:end]
+
+    def vectorized(self) -> bool:
+        return self.child.vectorized()  # type: ignore
+
+    def iter_batches(self) -> Iterator[Batch]:
+        """Argsort the column of the child, then gather only the matching rows"""
+        batch = concat_batches(self.child.iter_batches())  # type: ignore
+        if batch is None:
+            return
+        order = np.argsort(batch[self.column], kind="stable")
+        keys = batch[self.column][order]
+        start = np.searchsorted(keys, self.value, side="left")
+        end = np.searchsorted(keys, self.value, side="right")
+        if end > start:
+            matches = order[start:end]
+            yield {name: column[matches] for name, column in batch.items()}
+
+    def estimate_cardinality(self) -> float:
+        return self.child.estimate_cardinality() * SELECTIVITY  # type: ignore
+
+    def __repr__(self):
+        return f"SortedRangeSelect({self.column} == {self.value!r})"
+
+    def _dot(self):
+        return f'  "{str(self)}" [shape=box]\n' + self.child._dot()
+
+
 class ProjectOp(Operator):
     """Project columns from a table"""
 
@@ -157,11 +650,26 @@ class ProjectOp(Operator):
         super(ProjectOp, self).__init__()
         self.columns = columns
         self.child = child
+        self._columns = tuple(columns)
+        if len(self._columns) > 1:
+            self._getter = itemgetter(*self._columns)
+        else:
+            # itemgetter returns a bare value instead of a tuple for one column
+            self._getter = lambda row: tuple(row[column] for column in self._columns)
 
     def __iter__(self):
         """Iterate over the rows produced by this operator"""
+        columns, getter = self._columns, self._getter
         for row in self.child:  # type: ignore
-            yield {column: row[column] for column in self.columns}
+            yield dict(zip(columns, getter(row)))
+
+    def vectorized(self) -> bool:
+        return self.child.vectorized()  # type: ignore
+
+    def iter_batches(self) -> Iterator[Batch]:
+        """Project each batch of the child by keeping only the projected columns"""
+        for batch in self.child.iter_batches():  # type: ignore
+            yield {column: batch[column] for column in self.columns}
 
     def __repr__(self):
         return f"Project({self.columns})"
@@ -176,16 +684,26 @@ class JoinOp(Operator):
     def __init__(self, predicate, left_child, right_child):
         super(JoinOp, self).__init__()
         self.predicate = predicate
+        self._predicate = compile_predicate(predicate)
         self.left_child = left_child
         self.right_child = right_child
 
     def __iter__(self):
         """Iterate over the rows produced by this operator"""
-        # nested loop join
+        # nested loop join; the inner input is read once and kept in memory
+        right_rows = list(self.right_child)
         for left_row in self.left_child:
-            for right_row in self.right_child:
-                if eval(self.predicate, globals(), {**left_row, **right_row}):
-                    yield {**left_row, **right_row}
+            for right_row in right_rows:
+                # merge once; the same dictionary is checked and yielded
+                row = left_row | right_row
+                if self._predicate(row):
+                    yield row
+
+    def estimate_cardinality(self) -> float:
+        return max(
+            self.left_child.estimate_cardinality(),
+            self.right_child.estimate_cardinality(),
+        )
 
     def __repr__(self):
         return f"Join({self.predicate})"
@@ -199,7 +717,8 @@ class JoinOp(Operator):
 
 
 class HashJoinOp(Operator):
-    """Hash join two tables"""
+    """Hash join two tables. The hash table is built on the input estimated to
+    produce fewer rows and probed with the other one."""
 
     def __init__(self, predicate: Tuple[str, str], left_child, right_child):
         super(HashJoinOp, self).__init__()
@@ -209,20 +728,105 @@ class HashJoinOp(Operator):
 
     def __iter__(self):
         """Iterate over the rows produced by this operator"""
-        # build hash table
+        if self.vectorized():
+            for batch in self.iter_batches():
+                yield from batch_to_rows(batch)
+            return
+
+        if self.build_left():
+            # build hash table
+            hash_table = {}
+            for row in self.left_child:
+                key = row[self.predicate[0]]
+                if key not in hash_table:
+                    hash_table[key] = []
+                hash_table[key].append(row)
+
+            # probe hash table
+            for row in self.right_child:
+                key = row[self.predicate[1]]
+                if key in hash_table:
+                    for left_row in hash_table[key]:
+                        yield left_row | row
+        else:
+            # build hash table
+            hash_table = {}
+            for row in self.right_child:
+                key = row[self.predicate[1]]
+                if key not in hash_table:
+                    hash_table[key] = []
+                hash_table[key].append(row)
+
+            # probe hash table
+            for row in self.left_child:
+                key = row[self.predicate[0]]
+                if key in hash_table:
+                    for right_row in hash_table[key]:
+                        yield row | right_row
+
+    def build_left(self) -> bool:
+        """Whether to build the hash table on the left input (the smaller one)"""
+        return (
+            self.left_child.estimate_cardinality()
+            <= self.right_child.estimate_cardinality()
+        )
+
+    def vectorized(self) -> bool:
+        return (
+            jit_join.AVAILABLE
+            and self.left_child.vectorized()
+            and self.right_child.vectorized()
+        )
+
+    def iter_batches(self) -> Iterator[Batch]:
+        """
+        Join the columns of both children by computing the positions of the matching
+        rows, then gathering both sides with integer indexing. int64 keys are
+        hashed by the compiled kernels in jit_join; other keys use a Python dict.
+        """
+        left = concat_batches(self.left_child.iter_batches())
+        right = concat_batches(self.right_child.iter_batches())
+        if left is None or right is None:
+            return
+        left_keys = left[self.predicate[0]]
+        right_keys = right[self.predicate[1]]
+
+        if self.build_left():
+            left_idx, right_idx = self._match(left_keys, right_keys)
+        else:
+            right_idx, left_idx = self._match(right_keys, left_keys)
+
+        if len(left_idx):
+            batch = {name: column[left_idx] for name, column in left.items()}
+            batch.update({name: column[right_idx] for name, column in right.items()})
+            yield batch
+
+    @staticmethod
+    def _match(
+        build_keys: np.ndarray, probe_keys: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the positions of the matching (build, probe) pairs of keys"""
+        if build_keys.dtype == np.int64 and probe_keys.dtype == np.int64:
+            table, next_idx = jit_join.build_int64(build_keys)
+            return jit_join.probe_int64(table, next_idx, probe_keys)
+
         hash_table = {}
-        for row in self.left_child:
-            key = row[self.predicate[0]]
-            if key not in hash_table:
-                hash_table[key] = []
-            hash_table[key].append(row)
-
-        # probe hash table
-        for row in self.right_child:
-            key = row[self.predicate[1]]
-            if key in hash_table:
-                for left_row in hash_table[key]:
-                    yield {**left_row, **row}
+        for i, key in enumerate(build_keys.tolist()):
+            hash_table.setdefault(key, []).append(i)
+        matches = [
+            (i, j)
+            for j, key in enumerate(probe_keys.tolist())
+            for i in hash_table.get(key, ())
+        ]
+        build_idx = np.array([i for i, _ in matches], dtype=np.int64)
+        probe_idx = np.array([j for _, j in matches], dtype=np.int64)
+        return build_idx, probe_idx
+
+    def estimate_cardinality(self) -> float:
+        return max(
+            self.left_child.estimate_cardinality(),
+            self.right_child.estimate_cardinality(),
+        )
 
     def __repr__(self):
         return f"HashJoin({self.predicate})"
@@ -235,6 +839,68 @@ class HashJoinOp(Operator):
         )
 
 
+class IndexedHashJoinOp(Operator):
+    """Hash join a table with an index on its join attribute to another input.
+    The index serves as the hash table, so only the other input is read and
+    each of its rows probes the index."""
+
+    def __init__(
+        self,
+        predicate: Tuple[str, str],
+        table: Relation,
+        child: Operator,
+        table_side: str = "left",
+    ):
+        super(IndexedHashJoinOp, self).__init__()
+        if table_side not in ("left", "right"):
+            raise ValueError(f"table_side must be 'left' or 'right': {table_side}")
+        self.predicate = predicate
+        self.table = table
+        self.child = child
+        self.table_side = table_side
+        index_key = predicate[0] if table_side == "left" else predicate[1]
+        self._index = table.indexes.get(index_key)
+        if self._index is None:
+            raise ValueError(f"No index on attribute: {index_key}")
+
+    def __iter__(self):
+        """Iterate over the rows produced by this operator"""
+        names = self.table.attribute_names
+        get = self._index.get  # type: ignore
+        # number of tuples fetched from the index, charged as page reads at the end
+        read = 0
+        if self.table_side == "left":
+            probe_key = self.predicate[1]
+            for row in self.child:  # type: ignore
+                matches = get(row[probe_key], ())
+                read += len(matches)
+                for t in matches:
+                    yield dict(zip(names, t)) | row
+        else:
+            probe_key = self.predicate[0]
+            for row in self.child:  # type: ignore
+                matches = get(row[probe_key], ())
+                read += len(matches)
+                for t in matches:
+                    yield row | dict(zip(names, t))
+        self.table.read_pages(read)
+
+    def estimate_cardinality(self) -> float:
+        child = self.child.estimate_cardinality()  # type: ignore
+        return max(len(self.table.tuples), child)
+
+    def __repr__(self):
+        return f"IndexedHashJoin({self.predicate})"
+
+    def _dot(self):
+        index_key = self.predicate[0 if self.table_side == "left" else 1]
+        return (
+            f'  "{str(self)}" [shape=box]\n'
+            + f'  "Index({self.table.name}, {index_key})" [shape=box]\n'
+            + self.child._dot()  # type: ignore
+        )
+
+
 class RenameOp(Operator):
     """Rename a table and its attributes"""
 
@@ -268,11 +934,27 @@ class OrderByOp(Operator):
 
     def __iter__(self):
         """Iterate over the rows produced by this operator"""
+        if self.vectorized():
+            for batch in self.iter_batches():
+                yield from batch_to_rows(batch)
+            return
+
         rows = list(self.child)
-        rows.sort(key=lambda row: row[self.column])
+        rows.sort(key=itemgetter(self.column))
         for row in rows:
             yield row
 
+    def vectorized(self) -> bool:
+        return self.child.vectorized()  # type: ignore
+
+    def iter_batches(self) -> Iterator[Batch]:
+        """Sort the columns of the child with a single stable argsort"""
+        batch = concat_batches(self.child.iter_batches())  # type: ignore
+        if batch is None:
+            return
+        order = np.argsort(batch[self.column], kind="stable")
+        yield {name: column[order] for name, column in batch.items()}
+
     def __repr__(self):
         return f"OrderBy({self.column})"
 
@@ -2,12 +2,19 @@
 Defines a simple representation of relations and relational algebra for the purposes
 of teaching relational algebra and query optimization to undergraduates.
 """
+import math
 import time
 from faker import Faker
 from dataclasses import dataclass, field
-from typing import Tuple, List, Any, Optional
-import random
-import bintrees
+from typing import Tuple, List, Dict, Any, Optional, Iterator
+import numpy as np
+
+# NumPy dtype used to store each attribute domain column-wise; anything else is
+# stored as a column of Python objects
+DTYPES = {int: np.int64, float: np.float64, bool: np.bool_}
+
+# maximum number of distinct Faker strings generated for each str attribute
+STRING_POOL_SIZE = 10_000
 
 
 @dataclass(frozen=True)
@@ -23,20 +30,119 @@ class Schema:
     attributes: Tuple[Attribute, ...]
 
 
+@dataclass
+class Index:
+    """
+    Represents an index on the attribute at the given position of a relation's tuples.
+    Equality lookups go through a hash table from each key to its tuples; the keys
+    are also kept as a sorted NumPy array for ordered iteration and range lookups.
+    """
+    position: int
+    buckets: Dict[Any, List[Tuple]] = field(default_factory=dict)
+    _sorted_keys: Optional[np.ndarray] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def insert(self, tuples: List[Tuple]):
+        """Insert tuples into the index."""
+        for t in tuples:
+            key = t[self.position]
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                self.buckets[key] = [t]
+                self._sorted_keys = None
+            else:
+                bucket.append(t)
+
+    def clear(self):
+        """Remove all tuples from the index."""
+        self.buckets.clear()
+        self._sorted_keys = None
+
+    def get(self, key: Any, default: Any = None) -> Optional[List[Tuple]]:
+        """Return the tuples with the given key."""
+        return self.buckets.get(key, default)
+
+    @property
+    def sorted_keys(self) -> np.ndarray:
+        """The distinct keys of the index in ascending order."""
+        if self._sorted_keys is None:
+            self._sorted_keys = np.array(sorted(self.buckets))
+        return self._sorted_keys
+
+    def items(self) -> Iterator[Tuple[Any, List[Tuple]]]:
+        """Iterate over (key, tuples) pairs in ascending key order."""
+        for key in self.sorted_keys.tolist():
+            yield key, self.buckets[key]
+
+    def range(self, low: Any, high: Any) -> Iterator[Tuple]:
+        """Iterate over the tuples with low <= key <= high in ascending key order."""
+        keys = self.sorted_keys
+        start = np.searchsorted(keys, low, side="left")
+        end = np.searchsorted(keys, high, side="right")
+        for key in keys[start:end].tolist():
+            yield from self.buckets[key]
+
+
 @dataclass
 class Relation:
     """Represents a relation as a set of tuples."""
     name: str
     schema: Schema
     tuples: List[Tuple] = field(default_factory=list)
-    indexes: dict = field(default_factory=dict)  # This will hold our B-Tree indexes
-    # sleeptime is used to simulate the time it takes to read a tuple from disk
+    indexes: Dict[str, Index] = field(default_factory=dict)
+    # sleeptime is used to simulate the time it takes to read a page of tuples from disk
     # 0.0 = in-memory, 0.01 = SSD, 0.1 = HDD (rough estimates)
     sleeptime: float = 0.0
+    # number of tuples stored on each page
+    page_size: int = 4096
+    # column-wise copy of the tuples, built lazily by the columns property
+    _columns: Optional[Dict[str, np.ndarray]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # the tuple list, its length and the version the column-wise copy was built from
+    _columns_tuples: Optional[List[Tuple]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _columns_size: int = field(default=0, init=False, repr=False, compare=False)
+    _columns_version: int = field(default=0, init=False, repr=False, compare=False)
+    # bumped whenever the relation changes its tuples
+    _version: int = field(default=0, init=False, repr=False, compare=False)
+    # names of the attributes in schema order, used to turn tuples into rows
+    attribute_names: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.attribute_names = tuple(attr.name for attr in self.schema.attributes)
 
     def clear(self):
         """Clear the relation of all tuples."""
         self.tuples = []
+        self._columns = None
+        self._version += 1
+        # indexes are emptied in place, as operators may hold on to them
+        for index in self.indexes.values():
+            index.clear()
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        """The tuples of the relation stored as one NumPy array per attribute."""
+        n = len(self.tuples)
+        if (
+            self._columns is None
+            or self._columns_tuples is not self.tuples
+            or self._columns_size != n
+            or self._columns_version != self._version
+        ):
+            columns = {}
+            for position, attr in enumerate(self.schema.attributes):
+                column = np.empty(n, dtype=DTYPES.get(attr.domain, object))
+                column[:] = [t[position] for t in self.tuples]
+                columns[attr.name] = column
+            self._columns = columns
+            self._columns_tuples = self.tuples
+            self._columns_size = n
+            self._columns_version = self._version
+        return self._columns
 
     def create_index(self, attribute_name: str):
         """Create an index on the specified attribute."""
@@ -44,49 +150,76 @@ class Relation:
         if attr_position is None:
             raise ValueError(f"No such attribute: {attribute_name}")
 
-        index = bintrees.RBTree()
-        for t in sorted(self.tuples, key=lambda t: t[attr_position]):
-            key = t[attr_position]
-            if key not in index:
-                index[key] = []
-            index[key].append(t)
+        index = self.indexes.get(attribute_name)
+        if index is None:
+            index = self.indexes[attribute_name] = Index(attr_position)
+        else:
+            index.clear()
+        index.insert(self.tuples)
 
-        self.indexes[attribute_name] = index
+    def read_pages(self, n: int) -> None:
+        """Simulate reading the pages holding n tuples from disk."""
+        if self.sleeptime > 0 and n > 0:
+            time.sleep(math.ceil(n / self.page_size) * self.sleeptime)
 
     # iterate over tuples in the relation
     def __iter__(self):
-        for t in self.tuples:
-            time.sleep(self.sleeptime)
+        for i, t in enumerate(self.tuples):
+            if i % self.page_size == 0:
+                time.sleep(self.sleeptime)
             yield t
 
     def iter_index(self, attribute_name: str):
         """Iterate over tuples in the relation using an index."""
         index = self.indexes.get(attribute_name)
-        if not index:
+        if index is None:
             raise ValueError(f"No index on attribute: {attribute_name}")
+        read = 0
         for key, tuples in index.items():
-            time.sleep(self.sleeptime)
-            yield from tuples
+            for t in tuples:
+                if read % self.page_size == 0:
+                    time.sleep(self.sleeptime)
+                read += 1
+                yield t
 
     def to_hdd(self) -> "Relation":
         """Return a new relation that is stored on disk."""
         return Relation(
-            self.name, self.schema, self.tuples, self.indexes, sleeptime=0.1
+            self.name,
+            self.schema,
+            self.tuples,
+            self.indexes,
+            sleeptime=0.1,
+            page_size=self.page_size,
         )
 
     def to_ssd(self) -> "Relation":
         """Return a new relation that is stored on SSD."""
         return Relation(
-            self.name, self.schema, self.tuples, self.indexes, sleeptime=0.01
+            self.name,
+            self.schema,
+            self.tuples,
+            self.indexes,
+            sleeptime=0.01,
+            page_size=self.page_size,
         )
 
     def find_by_index(self, attribute_name: str, value: Any) -> Optional[List[Tuple]]:
         """Find tuples by indexed attribute."""
         index = self.indexes.get(attribute_name)
-        if not index:
+        if index is None:
             raise ValueError(f"No index on attribute: {attribute_name}")
         return index.get(value, [])
 
+    def find_range_by_index(
+        self, attribute_name: str, low: Any, high: Any
+    ) -> List[Tuple]:
+        """Find tuples whose indexed attribute lies between low and high (inclusive)."""
+        index = self.indexes.get(attribute_name)
+        if index is None:
+            raise ValueError(f"No index on attribute: {attribute_name}")
+        return list(index.range(low, high))
+
     def _get_attribute_position(self, attribute_name: str) -> Optional[int]:
         """Get the position of an attribute in the schema."""
         for i, attr in enumerate(self.schema.attributes):
@@ -97,37 +230,50 @@ class Relation:
     def generate_tuples(self, n: int) -> None:
         """Generate n tuples with random values for each attribute."""
         fake = Faker()
+        old_len = len(self.tuples)
+        # strings are sampled from a pool of Faker values generated once per call
+        pool_size = max(1, min(n, STRING_POOL_SIZE))
+
+        columns = []
+        for attr in self.schema.attributes:
+            if attr.domain is float:
+                # generates floats between 0 and 100
+                columns.append(np.random.uniform(0.0, 100.0, n))
+            elif attr.domain is bool:
+                columns.append(np.random.random(n) < 0.5)
+            elif attr.domain is int and attr.name == "year":
+                columns.append(np.random.randint(1950, 2021, n))
+            elif attr.domain is int:
+                # generates ints between 0 and 100
+                columns.append(np.random.randint(0, 101, n))
+            elif attr.domain is str:
+                if attr.name == "name":
+                    pool = [fake.name() for _ in range(pool_size)]
+                elif attr.name == "title":
+                    pool = [fake.sentence(nb_words=3) for _ in range(pool_size)]
+                else:
+                    # generates a random text
+                    pool = [fake.text(max_nb_chars=20) for _ in range(pool_size)]
+                columns.append(
+                    np.array(pool, dtype=object)[np.random.randint(0, pool_size, n)]
+                )
+            # You can add more domain types or adjust attributes based on their names here.
+
+        self.tuples.extend(zip(*(column.tolist() for column in columns)))
+        self._version += 1
+        if old_len == 0 and len(columns) == len(self.schema.attributes):
+            # the generated columns already are the column-wise copy of the relation
+            self._columns = {
+                attr.name: column.astype(DTYPES.get(attr.domain, object), copy=False)
+                for attr, column in zip(self.schema.attributes, columns)
+            }
+            self._columns_tuples = self.tuples
+            self._columns_size = n
+            self._columns_version = self._version
 
-        for _ in range(n):
-            tuple_values = []
-            for attr in self.schema.attributes:
-                if attr.domain is float:
-                    tuple_values.append(
-                        random.uniform(0.0, 100.0)
-                    )  # generates float between 0 and 100
-                elif attr.domain is bool:
-                    tuple_values.append(random.choice([True, False]))
-                elif attr.domain is str and attr.name == "name":
-                    tuple_values.append(fake.name())
-                elif attr.domain is str and attr.name == "title":
-                    tuple_values.append(fake.sentence(nb_words=3))
-                elif attr.domain is int and attr.name == "year":
-                    tuple_values.append(random.randint(1950, 2020))
-                elif attr.domain is int:
-                    tuple_values.append(
-                        random.randint(0, 100)
-                    )  # generates int between 0 and 100
-                elif attr.domain is str:
-                    tuple_values.append(
-                        fake.text(max_nb_chars=20)
-                    )  # generates a random text
-                # You can add more domain types or adjust attributes based on their names here.
-
-            self.tuples.append(tuple(tuple_values))
-
-        # update indexes
-        for attr_name in self.indexes:
-            self.create_index(attr_name)
+        # insert only the new tuples into the existing indexes
+        for index in self.indexes.values():
+            index.insert(self.tuples[old_len:])
 
 
 if __name__ == "__main__":
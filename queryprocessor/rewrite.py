@@ -0,0 +1,127 @@
+"""
+Rule-based rewrites of query plans built from the operators in operator.py
+"""
+import copy
+from queryprocessor.operator import (
+    Operator,
+    ScanOp,
+    IndexScanOp,
+    SelectOp,
+    ProjectOp,
+    JoinOp,
+    HashJoinOp,
+    IndexedHashJoinOp,
+    OrderedSelectOp,
+    SortedRangeSelectOp,
+    OrderByOp,
+    predicate_columns,
+)
+from typing import Optional, Set
+
+# attributes holding the inputs of an operator
+CHILDREN = ("child", "left_child", "right_child")
+
+
+def output_columns(op: Operator) -> Optional[Set[str]]:
+    """Return the names of the attributes produced by an operator, or None if unknown"""
+    if isinstance(op, (ScanOp, IndexScanOp)):
+        return {attr.name for attr in op.table.schema.attributes}
+    if isinstance(op, ProjectOp):
+        return set(op.columns)
+    if isinstance(op, (SelectOp, OrderedSelectOp, SortedRangeSelectOp, OrderByOp)):
+        return output_columns(op.child)  # type: ignore
+    if isinstance(op, (JoinOp, HashJoinOp)):
+        left = output_columns(op.left_child)
+        right = output_columns(op.right_child)
+        if left is None or right is None:
+            return None
+        return left | right
+    if isinstance(op, IndexedHashJoinOp):
+        child = output_columns(op.child)  # type: ignore
+        if child is None:
+            return None
+        return set(op.table.attribute_names) | child
+    return None
+
+
+def optimize(op: Operator) -> Operator:
+    """Apply all rewrite rules to the plan rooted at op"""
+    return use_indexes(pushdown_select(op))
+
+
+def pushdown_select(op: Operator) -> Operator:
+    """
+    Rewrite the plan rooted at op so that every SelectOp sits as far below joins and
+    projections as the attributes in its predicate allow, then merge adjacent
+    selections. The operators of the original plan are not modified.
+    """
+    return _merge_selects(_pushdown(op))
+
+
+def _pushdown(op: Operator) -> Operator:
+    op = copy.copy(op)
+    for name in CHILDREN:
+        child = getattr(op, name, None)
+        if isinstance(child, Operator):
+            setattr(op, name, _pushdown(child))
+    if isinstance(op, SelectOp):
+        return _push_select(op.predicate, op.child)  # type: ignore
+    return op
+
+
+def _push_select(predicate: str, op: Operator) -> Operator:
+    """Place a selection with the given predicate as far below op as possible"""
+    if isinstance(op, (SelectOp, SortedRangeSelectOp, ProjectOp, OrderByOp)):
+        op = copy.copy(op)
+        op.child = _push_select(predicate, op.child)  # type: ignore
+        return op
+
+    if isinstance(op, (JoinOp, HashJoinOp)):
+        columns = predicate_columns(predicate)
+        left = output_columns(op.left_child)
+        right = output_columns(op.right_child)
+        # attributes of the right input shadow those of the left in joined rows
+        if right is not None and columns <= right:
+            op = copy.copy(op)
+            op.right_child = _push_select(predicate, op.right_child)
+            return op
+        if left is not None and right is not None and columns <= left - right:
+            op = copy.copy(op)
+            op.left_child = _push_select(predicate, op.left_child)
+            return op
+
+    return SelectOp(predicate, op)
+
+
+def use_indexes(op: Operator) -> Operator:
+    """
+    Replace each HashJoinOp with an input that scans a relation indexed on its join
+    attribute by an IndexedHashJoinOp probing that index. When both inputs qualify,
+    the right one is used as the index.
+    """
+    op = copy.copy(op)
+    for name in CHILDREN:
+        child = getattr(op, name, None)
+        if isinstance(child, Operator):
+            setattr(op, name, use_indexes(child))
+    if not isinstance(op, HashJoinOp):
+        return op
+
+    left_key, right_key = op.predicate
+    right, left = op.right_child, op.left_child
+    if isinstance(right, ScanOp) and right_key in right.table.indexes:
+        return IndexedHashJoinOp(op.predicate, right.table, left, table_side="right")
+    if isinstance(left, ScanOp) and left_key in left.table.indexes:
+        return IndexedHashJoinOp(op.predicate, left.table, right, table_side="left")
+    return op
+
+
+def _merge_selects(op: Operator) -> Operator:
+    for name in CHILDREN:
+        child = getattr(op, name, None)
+        if isinstance(child, Operator):
+            setattr(op, name, _merge_selects(child))
+    if isinstance(op, SelectOp) and isinstance(op.child, SelectOp):
+        inner = op.child
+        return SelectOp(f"({inner.predicate}) and ({op.predicate})", inner.child)
+    return op